@@ -11,20 +11,31 @@ Design:
 - TTL: 30 days per segment
 """
 
+import heapq
 import numpy as np
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import deque
+from collections import OrderedDict
 import logging
 
+from kernels import fold_batch_into_ring, gather_scores
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VehicleSample:
-    """Single vehicle sample for a segment."""
-    
+    """
+    Single vehicle sample for a segment.
+
+    Not used on the storage path (SegmentBuffer keeps samples as parallel
+    arrays); materialized on demand for API-facing code. Slotted and
+    frozen to avoid the per-instance __dict__ overhead.
+    """
+
     comfort_score: float
     confidence: float
     vehicle_id: str
@@ -33,55 +44,151 @@ class VehicleSample:
     heading: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SegmentBuffer:
-    """Aggregation buffer for a road segment."""
-    
+    """
+    Aggregation buffer for a road segment.
+
+    Samples are stored as fixed-size parallel arrays (structure-of-arrays)
+    forming a ring buffer: contiguous C memory instead of a deque of
+    scattered per-sample Python objects.
+    """
+
     segment_id: str
-    samples: deque = field(default_factory=lambda: deque(maxlen=10))  # N=10
+    capacity: int = 10  # N=10
     aggregated_score: float = 0.5
     last_updated: datetime = field(default_factory=datetime.utcnow)
     expires_at: Optional[datetime] = None
-    
-    def add_sample(self, sample: VehicleSample) -> None:
-        """Add vehicle sample and update aggregated score."""
-        self.samples.append(sample)
+    # Running sums for O(1) incremental aggregation (avoid NumPy recompute
+    # over the whole buffer on every insert)
+    _wsum: float = 0.0    # sum of confidences (weights)
+    _wxsum: float = 0.0   # sum of confidence * comfort_score
+    _csum: float = 0.0    # sum of confidences (for average_confidence)
+    # Monotonic expiry timestamp; cheaper to compare than datetime objects
+    _expires_at_mono: float = 0.0
+    # Ring-buffer state: next write slot and current fill level
+    _head: int = 0
+    _n: int = 0
+    # Sample columns, allocated in __post_init__ (declared here so they
+    # get slots)
+    _scores: np.ndarray = field(init=False, repr=False)
+    _confs: np.ndarray = field(init=False, repr=False)
+    _speeds: np.ndarray = field(init=False, repr=False)
+    _headings: np.ndarray = field(init=False, repr=False)
+    _ts: np.ndarray = field(init=False, repr=False)
+    _vehicle_ids: List[str] = field(init=False, repr=False)
+
+    TTL_SECONDS = 2592000.0  # 30 days
+
+    def __post_init__(self):
+        cap = self.capacity
+        self._scores = np.zeros(cap, dtype=np.float32)
+        self._confs = np.zeros(cap, dtype=np.float32)
+        self._speeds = np.zeros(cap, dtype=np.float32)
+        self._headings = np.zeros(cap, dtype=np.float32)
+        self._ts = np.zeros(cap, dtype=np.float64)  # epoch seconds
+        self._vehicle_ids: List[str] = [""] * cap
+
+    def reset(self, segment_id: str) -> None:
+        """Reinitialize for reuse from the buffer pool (keeps the arrays)."""
+        self.segment_id = segment_id
+        self.aggregated_score = 0.5
+        self.last_updated = datetime.utcnow()
+        self.expires_at = None
+        self._wsum = 0.0
+        self._wxsum = 0.0
+        self._csum = 0.0
+        self._expires_at_mono = 0.0
+        self._head = 0
+        self._n = 0
+
+    def add_sample(
+        self,
+        comfort_score: float,
+        confidence: float,
+        vehicle_id: str,
+        timestamp: datetime,
+        speed: float = 0.0,
+        heading: float = 0.0,
+        now_mono: Optional[float] = None
+    ) -> None:
+        """Add vehicle sample and update aggregated score incrementally."""
+        slot = self._head
+
+        # If the ring is full, the slot being overwritten holds the oldest
+        # sample; remove its contribution from the running sums first.
+        if self._n == self.capacity:
+            old_conf = float(self._confs[slot])
+            self._wsum -= old_conf
+            self._wxsum -= old_conf * float(self._scores[slot])
+            self._csum -= old_conf
+
+        self._scores[slot] = comfort_score
+        self._confs[slot] = confidence
+        self._speeds[slot] = speed
+        self._headings[slot] = heading
+        self._ts[slot] = timestamp.timestamp()
+        self._vehicle_ids[slot] = vehicle_id
+        self._head = (slot + 1) % self.capacity
+        self._n = min(self._n + 1, self.capacity)
+
+        self._wsum += confidence
+        self._wxsum += confidence * comfort_score
+        self._csum += confidence
+
+        if now_mono is None:
+            now_mono = time.monotonic()
+        self._expires_at_mono = now_mono + self.TTL_SECONDS
         self.last_updated = datetime.utcnow()
         self._update_aggregation()
-    
+
     def _update_aggregation(self) -> None:
-        """Recompute aggregated score from buffer samples."""
-        if not self.samples:
+        """Update aggregated score from the running weighted sums."""
+        if self._n == 0 or self._wsum <= 0:
             self.aggregated_score = 0.5
             return
-        
-        # Weighted mean by confidence
-        scores = np.array([s.comfort_score for s in self.samples])
-        weights = np.array([s.confidence for s in self.samples])
-        weights = weights / np.sum(weights)  # Normalize
-        
-        self.aggregated_score = float(np.average(scores, weights=weights))
-        
-        # Update expiration time (30 days from last update)
-        self.expires_at = self.last_updated + timedelta(days=30)
-    
-    def is_valid(self) -> bool:
-        """Check if cache is still valid."""
-        if self.expires_at is None:
+
+        # Weighted mean by confidence: sum(w*x) / sum(w)
+        self.aggregated_score = self._wxsum / self._wsum
+
+        # Wall-clock expiration kept only for API serialization
+        self.expires_at = self.last_updated + timedelta(seconds=self.TTL_SECONDS)
+
+    def is_valid(self, now_mono: Optional[float] = None) -> bool:
+        """Check if cache is still valid (monotonic clock comparison)."""
+        if self._expires_at_mono == 0.0:
             return False
-        return datetime.utcnow() < self.expires_at
-    
+        if now_mono is None:
+            now_mono = time.monotonic()
+        return now_mono < self._expires_at_mono
+
     def is_finalized(self) -> bool:
         """Check if buffer has enough samples (N=10)."""
-        return len(self.samples) >= 10
-    
+        return self._n >= self.capacity
+
     def sample_count(self) -> int:
-        return len(self.samples)
-    
+        return self._n
+
     def average_confidence(self) -> float:
-        if not self.samples:
+        if self._n == 0:
             return 0.0
-        return np.mean([s.confidence for s in self.samples])
+        return self._csum / self._n
+
+    def recent_samples(self, limit: int = 10) -> List[Dict[str, any]]:
+        """Materialize the most recent samples as dicts, newest first."""
+        count = min(limit, self._n)
+        samples = []
+        for i in range(count):
+            slot = (self._head - 1 - i) % self.capacity
+            samples.append({
+                'vehicle_id': self._vehicle_ids[slot],
+                'comfort_score': float(self._scores[slot]),
+                'confidence': float(self._confs[slot]),
+                'timestamp': datetime.fromtimestamp(self._ts[slot]),
+                'speed': float(self._speeds[slot]),
+                'heading': float(self._headings[slot])
+            })
+        return samples
 
 
 class AggregationService:
@@ -95,15 +202,208 @@ class AggregationService:
     - Weighting: by model confidence
     """
     
-    def __init__(self, segment_buffer_limit: int = 10, ttl_days: int = 30):
+    # Initial capacity of the structure-of-arrays stat columns
+    _INITIAL_CAPACITY = 64
+    # Lock stripes; power of two so the stripe index is a cheap bitmask
+    _NUM_STRIPES = 64
+    # Upper bound on pooled SegmentBuffer objects kept for reuse
+    _POOL_SIZE = 1024
+
+    def __init__(
+        self,
+        segment_buffer_limit: int = 10,
+        ttl_days: int = 30,
+        max_segments: int = 100_000,
+        cache_manager=None
+    ):
         self.BUFFER_LIMIT = segment_buffer_limit
         self.TTL = timedelta(days=ttl_days)
-        
-        # In-memory segment buffers
-        self.buffers: Dict[str, SegmentBuffer] = {}
-        
-        logger.info(f"AggregationService initialized: N={self.BUFFER_LIMIT}, TTL={ttl_days} days")
-    
+        self.MAX_SEGMENTS = max_segments
+
+        # Optional CacheManager written through synchronously on ingest
+        # (under the segment's stripe lock), so the cache can never lag
+        # the buffer and no background task is needed
+        self.cache_manager = cache_manager
+
+        # Segment-id interning: strings are hashed once on first sight and
+        # replaced by a stable integer surrogate everywhere else, so the
+        # hot-path dicts use CPython's fast int hashing. The table only
+        # grows with distinct segments ever seen (surrogates must stay
+        # stable); the reverse list recovers names for API responses.
+        self._intern: Dict[str, int] = {}
+        self._sid_names: List[str] = []
+
+        # In-memory segment buffers (per-segment detail) keyed by
+        # surrogate id, LRU-ordered: least-recently-updated segments sit
+        # at the front for eviction
+        self.buffers: "OrderedDict[int, SegmentBuffer]" = OrderedDict()
+
+        # Min-heap of (expires_mono, surrogate_id) for lazy TTL eviction;
+        # stale entries (segment refreshed or already evicted) are skipped
+        # on pop
+        self._expiry_heap: List[Tuple[float, int]] = []
+
+        # Striped locks: concurrent ingests to different segments proceed
+        # in parallel; a single meta lock guards structural state (buffer
+        # map, LRU order, stat columns, expiry heap)
+        self._locks = [threading.Lock() for _ in range(self._NUM_STRIPES)]
+        self._meta_lock = threading.Lock()
+
+        # Freelist of pre-initialized SegmentBuffer objects: new segments
+        # reuse a pooled buffer instead of allocating during cold-start
+        # bursts; evicted/expired buffers return to the pool (bounded at
+        # _POOL_SIZE so it cannot grow without limit)
+        self._free: List[SegmentBuffer] = [
+            SegmentBuffer(segment_id="", capacity=segment_buffer_limit)
+            for _ in range(self._POOL_SIZE)
+        ]
+
+        # Structure-of-arrays mirror of per-segment aggregates so that
+        # stats/cleanup/listing are vectorized reductions instead of
+        # per-buffer Python attribute walks. Scores/confidences are FP32
+        # (plenty for [0, 1] values and half the memory bandwidth);
+        # expiry stays FP64 so monotonic seconds keep sub-second precision.
+        self._idx: Dict[int, int] = {}          # surrogate_id -> row
+        self._ids: List[int] = []               # row -> surrogate_id
+        self._nrows = 0
+        cap = self._INITIAL_CAPACITY
+        self._scores = np.zeros(cap, dtype=np.float32)
+        self._counts = np.zeros(cap, dtype=np.int32)
+        self._expires = np.zeros(cap, dtype=np.float64)
+        self._conf_sum = np.zeros(cap, dtype=np.float32)
+
+        logger.info("AggregationService initialized: N=%d, TTL=%d days", self.BUFFER_LIMIT, ttl_days)
+
+    def _intern_id(self, segment_id: str) -> int:
+        """Map a segment-id string to its stable integer surrogate.
+
+        Caller must hold the meta lock when interning may occur.
+        """
+        sid = self._intern.get(segment_id)
+        if sid is None:
+            sid = len(self._sid_names)
+            self._intern[segment_id] = sid
+            self._sid_names.append(segment_id)
+        return sid
+
+    def _alloc_row(self, sid: int) -> int:
+        """Allocate a stat-column row for a new segment (amortized O(1))."""
+        row = self._nrows
+        if row == len(self._scores):
+            # Grow all columns by 2x
+            new_cap = len(self._scores) * 2
+            self._scores = np.resize(self._scores, new_cap)
+            self._counts = np.resize(self._counts, new_cap)
+            self._expires = np.resize(self._expires, new_cap)
+            self._conf_sum = np.resize(self._conf_sum, new_cap)
+        self._idx[sid] = row
+        self._ids.append(sid)
+        self._nrows += 1
+        return row
+
+    def _sync_row(self, row: int, buffer: SegmentBuffer) -> None:
+        """Mirror a buffer's aggregates into the stat columns."""
+        self._scores[row] = buffer.aggregated_score
+        self._counts[row] = buffer.sample_count()
+        self._expires[row] = buffer._expires_at_mono
+        self._conf_sum[row] = buffer._csum
+
+    def _remove_segment(self, sid: int) -> None:
+        """Drop a segment and swap-remove its stat-column row (O(1))."""
+        row = self._idx.pop(sid)
+        buffer = self.buffers.pop(sid)
+
+        # Return the buffer to the freelist for reuse (bounded)
+        if len(self._free) < self._POOL_SIZE:
+            self._free.append(buffer)
+
+        last = self._nrows - 1
+        if row != last:
+            # Move the last row into the freed slot
+            self._scores[row] = self._scores[last]
+            self._counts[row] = self._counts[last]
+            self._expires[row] = self._expires[last]
+            self._conf_sum[row] = self._conf_sum[last]
+            moved_sid = self._ids[last]
+            self._ids[row] = moved_sid
+            self._idx[moved_sid] = row
+        self._ids.pop()
+        self._nrows -= 1
+
+    def _compact_expiry_heap(self) -> None:
+        """Rebuild the expiry heap with one live entry per segment.
+
+        Caller must hold the meta lock. Every ingest pushes a fresh heap
+        entry and, with a 30-day TTL, the superseded ones would only
+        leave via cleanup_expired pops decades of samples later; without
+        compaction the heap grows with ingest volume, not segment count.
+        The stat columns hold each segment's current expiry, so the
+        rebuild is a single O(n) heapify.
+        """
+        self._expiry_heap = [
+            (float(self._expires[row]), sid) for sid, row in self._idx.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _stripe_for(self, segment_id: str) -> threading.Lock:
+        """Pick the lock stripe for a segment."""
+        return self._locks[hash(segment_id) & (self._NUM_STRIPES - 1)]
+
+    def _get_or_create_buffer(self, segment_id: str) -> Tuple[int, SegmentBuffer]:
+        """Fetch the segment's buffer, creating (or pooling) one if new.
+
+        Caller must hold the segment's stripe lock. Returns the
+        surrogate id and buffer.
+        """
+        with self._meta_lock:
+            sid = self._intern_id(segment_id)
+            buffer = self.buffers.get(sid)
+            if buffer is None:
+                if self._free:
+                    buffer = self._free.pop()
+                    buffer.reset(segment_id)
+                else:
+                    buffer = SegmentBuffer(
+                        segment_id=segment_id,
+                        capacity=self.BUFFER_LIMIT
+                    )
+                self.buffers[sid] = buffer
+                self._alloc_row(sid)
+            return sid, buffer
+
+    def _after_update(self, sid: int, buffer: SegmentBuffer) -> None:
+        """Sync structural state after a buffer mutation.
+
+        Caller must hold the segment's stripe lock.
+        """
+        with self._meta_lock:
+            row = self._idx.get(sid)
+            if row is not None:
+                self._sync_row(row, buffer)
+                self.buffers.move_to_end(sid)
+                heapq.heappush(
+                    self._expiry_heap,
+                    (buffer._expires_at_mono, sid)
+                )
+                # Bound the stale entries the lazy pushes accumulate
+                # (same 2x-live threshold cachetools' TLRU uses)
+                if len(self._expiry_heap) > 2 * len(self.buffers):
+                    self._compact_expiry_heap()
+            while len(self.buffers) > self.MAX_SEGMENTS:
+                evicted_sid = next(iter(self.buffers))
+                self._remove_segment(evicted_sid)
+                logger.debug("Evicted LRU segment %s", self._sid_names[evicted_sid])
+
+        # Write-through: still under the stripe lock, so cache and buffer
+        # cannot diverge
+        if self.cache_manager is not None:
+            self.cache_manager.update_segment(
+                segment_id=buffer.segment_id,
+                comfort_score=buffer.aggregated_score,
+                sample_count=buffer.sample_count(),
+                confidence=buffer.average_confidence()
+            )
+
     def ingest_prediction(
         self,
         segment_id: str,
@@ -130,33 +430,116 @@ class AggregationService:
             (aggregated_score, sample_count, is_finalized)
         """
         
+        now_mono = time.monotonic()
         if timestamp is None:
             timestamp = datetime.utcnow()
-        
-        # Get or create buffer
-        if segment_id not in self.buffers:
-            self.buffers[segment_id] = SegmentBuffer(segment_id=segment_id)
-        
-        buffer = self.buffers[segment_id]
-        
-        # Create and add sample
-        sample = VehicleSample(
-            comfort_score=comfort_score,
-            confidence=confidence,
-            vehicle_id=vehicle_id,
-            timestamp=timestamp,
-            speed=speed,
-            heading=heading
-        )
-        
-        buffer.add_sample(sample)
-        
-        is_finalized = buffer.is_finalized()
-        
-        if is_finalized:
-            logger.info(f"Segment {segment_id}: finalized with {buffer.sample_count()} samples")
-        
-        return buffer.aggregated_score, buffer.sample_count(), is_finalized
+
+        with self._stripe_for(segment_id):
+            sid, buffer = self._get_or_create_buffer(segment_id)
+
+            buffer.add_sample(
+                comfort_score=comfort_score,
+                confidence=confidence,
+                vehicle_id=vehicle_id,
+                timestamp=timestamp,
+                speed=speed,
+                heading=heading,
+                now_mono=now_mono
+            )
+
+            self._after_update(sid, buffer)
+
+            is_finalized = buffer.is_finalized()
+
+            # isEnabledFor gate skips the sample_count() call entirely
+            # when INFO is filtered out (per-request hot path)
+            if is_finalized and logger.isEnabledFor(logging.INFO):
+                logger.info("Segment %s: finalized with %d samples", segment_id, buffer.sample_count())
+
+            return buffer.aggregated_score, buffer.sample_count(), is_finalized
+
+    def ingest_batch(
+        self,
+        segment_id: str,
+        comfort_scores: np.ndarray,
+        confidences: np.ndarray,
+        vehicle_ids: List[str],
+        speeds: Optional[np.ndarray] = None,
+        headings: Optional[np.ndarray] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Tuple[float, int, bool]:
+        """
+        Ingest many predictions for one segment under a single lock
+        acquisition (amortizes per-sample locking and LRU bookkeeping).
+
+        Args:
+            segment_id: Road segment identifier
+            comfort_scores: Per-vehicle comfort predictions [0, 1]
+            confidences: Per-vehicle model confidences [0, 1]
+            vehicle_ids: Anonymized vehicle IDs (same length)
+            speeds, headings: Optional context arrays
+            timestamp: Shared prediction timestamp (default: now)
+
+        Returns:
+            (aggregated_score, sample_count, is_finalized)
+        """
+
+        now_mono = time.monotonic()
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+
+        n = len(comfort_scores)
+        if speeds is None:
+            speeds = np.zeros(n, dtype=np.float32)
+        if headings is None:
+            headings = np.zeros(n, dtype=np.float32)
+
+        with self._stripe_for(segment_id):
+            sid, buffer = self._get_or_create_buffer(segment_id)
+
+            # Only the last `capacity` samples can survive in the window;
+            # for over-full batches, reset and replay just those
+            start = 0
+            if n >= buffer.capacity:
+                buffer.reset(segment_id)
+                start = n - buffer.capacity
+
+            count = n - start
+            if count:
+                head0 = buffer._head
+
+                # JIT-compiled fold: one call per batch, no per-sample
+                # interpreter overhead
+                new_head, new_n, wsum, wxsum, csum = fold_batch_into_ring(
+                    buffer._scores, buffer._confs, buffer._speeds,
+                    buffer._headings, buffer._ts,
+                    buffer._head, buffer._n,
+                    buffer._wsum, buffer._wxsum, buffer._csum,
+                    np.ascontiguousarray(comfort_scores[start:], dtype=np.float32),
+                    np.ascontiguousarray(confidences[start:], dtype=np.float32),
+                    np.ascontiguousarray(speeds[start:], dtype=np.float32),
+                    np.ascontiguousarray(headings[start:], dtype=np.float32),
+                    timestamp.timestamp()
+                )
+
+                # Vehicle IDs are Python strings; mirror the same slot
+                # sequence outside the kernel
+                for i in range(count):
+                    slot = (head0 + i) % buffer.capacity
+                    buffer._vehicle_ids[slot] = vehicle_ids[start + i]
+
+                buffer._head = int(new_head)
+                buffer._n = int(new_n)
+                buffer._wsum = float(wsum)
+                buffer._wxsum = float(wxsum)
+                buffer._csum = float(csum)
+                buffer._expires_at_mono = now_mono + buffer.TTL_SECONDS
+                buffer.last_updated = datetime.utcnow()
+                buffer._update_aggregation()
+
+            self._after_update(sid, buffer)
+
+            return buffer.aggregated_score, buffer.sample_count(), buffer.is_finalized()
     
     def get_segment_score(self, segment_id: str) -> Optional[Dict[str, any]]:
         """
@@ -175,22 +558,49 @@ class AggregationService:
             or None if segment not in cache
         """
         
-        if segment_id not in self.buffers:
-            return None
-        
-        buffer = self.buffers[segment_id]
-        
-        return {
-            'segment_id': segment_id,
-            'comfort_score': buffer.aggregated_score,
-            'sample_count': buffer.sample_count(),
-            'confidence': buffer.average_confidence(),
-            'last_updated': buffer.last_updated,
-            'expires_at': buffer.expires_at,
-            'is_valid': buffer.is_valid(),
-            'is_finalized': buffer.is_finalized()
-        }
+        with self._stripe_for(segment_id):
+            sid = self._intern.get(segment_id)
+            buffer = self.buffers.get(sid) if sid is not None else None
+            if buffer is None:
+                return None
+
+            return {
+                'segment_id': segment_id,
+                'comfort_score': buffer.aggregated_score,
+                'sample_count': buffer.sample_count(),
+                'confidence': buffer.average_confidence(),
+                'last_updated': buffer.last_updated,
+                'expires_at': buffer.expires_at,
+                'is_valid': buffer.is_valid(),
+                'is_finalized': buffer.is_finalized()
+            }
     
+    def get_scores_bulk(
+        self,
+        segment_ids: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized score lookup for a list of segments (route evaluation).
+
+        Args:
+            segment_ids: Segment IDs to resolve
+
+        Returns:
+            (scores, known_mask): float32 comfort scores (0.5 for unknown
+            segments) and a boolean mask of which segments were found
+        """
+
+        with self._meta_lock:
+            intern = self._intern
+            col_idx = self._idx
+            idx = np.array(
+                [col_idx.get(intern.get(seg_id, -1), -1) for seg_id in segment_ids],
+                dtype=np.int64
+            )
+            scores, known = gather_scores(self._scores, idx, np.float32(0.5))
+
+        return scores, known
+
     def get_all_segments(
         self,
         include_invalid: bool = False,
@@ -207,25 +617,36 @@ class AggregationService:
             List of segment data dicts
         """
         
-        results = []
-        for segment_id, buffer in self.buffers.items():
-            if include_finalized_only and not buffer.is_finalized():
-                continue
-            if not include_invalid and not buffer.is_valid():
-                continue
-            
-            results.append({
-                'segment_id': segment_id,
-                'comfort_score': buffer.aggregated_score,
-                'sample_count': buffer.sample_count(),
-                'confidence': buffer.average_confidence(),
-                'last_updated': buffer.last_updated,
-                'expires_at': buffer.expires_at,
-                'is_valid': buffer.is_valid(),
-                'is_finalized': buffer.is_finalized()
-            })
-        
-        return results
+        now_mono = time.monotonic()
+
+        with self._meta_lock:
+            n = self._nrows
+
+            # Vectorized filtering over the stat columns
+            valid = self._expires[:n] > now_mono
+            finalized = self._counts[:n] >= self.BUFFER_LIMIT
+            mask = np.ones(n, dtype=bool)
+            if include_finalized_only:
+                mask &= finalized
+            if not include_invalid:
+                mask &= valid
+
+            results = []
+            for row in np.flatnonzero(mask):
+                sid = self._ids[row]
+                buffer = self.buffers[sid]
+                results.append({
+                    'segment_id': self._sid_names[sid],
+                    'comfort_score': buffer.aggregated_score,
+                    'sample_count': int(self._counts[row]),
+                    'confidence': buffer.average_confidence(),
+                    'last_updated': buffer.last_updated,
+                    'expires_at': buffer.expires_at,
+                    'is_valid': bool(valid[row]),
+                    'is_finalized': bool(finalized[row])
+                })
+
+            return results
     
     def get_recent_predictions(
         self,
@@ -243,24 +664,12 @@ class AggregationService:
             List of prediction records (sorted by recency)
         """
         
-        if segment_id not in self.buffers:
+        sid = self._intern.get(segment_id)
+        buffer = self.buffers.get(sid) if sid is not None else None
+        if buffer is None:
             return []
-        
-        buffer = self.buffers[segment_id]
-        
-        predictions = [
-            {
-                'vehicle_id': s.vehicle_id,
-                'comfort_score': s.comfort_score,
-                'confidence': s.confidence,
-                'timestamp': s.timestamp,
-                'speed': s.speed,
-                'heading': s.heading
-            }
-            for s in list(buffer.samples)[:limit]
-        ]
-        
-        return predictions
+
+        return buffer.recent_samples(limit)
     
     def cleanup_expired(self) -> int:
         """
@@ -270,42 +679,48 @@ class AggregationService:
             Number of removed segments
         """
         
-        expired_ids = [
-            seg_id for seg_id, buffer in self.buffers.items()
-            if not buffer.is_valid()
-        ]
-        
-        for seg_id in expired_ids:
-            del self.buffers[seg_id]
-        
-        if expired_ids:
-            logger.info(f"Cleaned up {len(expired_ids)} expired segments")
-        
-        return len(expired_ids)
+        now_mono = time.monotonic()
+        removed = 0
+
+        # Pop expired heap entries; skip stale ones (segment refreshed
+        # since the entry was pushed, or already evicted). O(k log n) in
+        # the number of expired entries rather than a full scan.
+        with self._meta_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now_mono:
+                expires_mono, sid = heapq.heappop(self._expiry_heap)
+                row = self._idx.get(sid)
+                if row is None:
+                    continue  # already evicted
+                if self._expires[row] > expires_mono:
+                    continue  # refreshed since this entry was pushed
+                self._remove_segment(sid)
+                removed += 1
+
+        if removed:
+            logger.info("Cleaned up %d expired segments", removed)
+
+        return removed
     
     def get_stats(self) -> Dict[str, any]:
         """Get aggregation service statistics."""
         
-        all_segments = list(self.buffers.values())
-        valid_segments = [b for b in all_segments if b.is_valid()]
-        finalized = [b for b in valid_segments if b.is_finalized()]
-        
-        avg_samples = (
-            np.mean([b.sample_count() for b in valid_segments])
-            if valid_segments else 0
-        )
-        avg_comfort = (
-            np.mean([b.aggregated_score for b in valid_segments])
-            if valid_segments else 0.5
-        )
-        
+        now_mono = time.monotonic()
+        with self._meta_lock:
+            n = self._nrows
+            valid = self._expires[:n] > now_mono
+            n_valid = int(valid.sum())
+            n_finalized = int((valid & (self._counts[:n] >= self.BUFFER_LIMIT)).sum())
+
+            avg_samples = float(self._counts[:n][valid].mean()) if n_valid else 0.0
+            avg_comfort = float(self._scores[:n][valid].mean()) if n_valid else 0.5
+
         return {
-            'total_segments': len(all_segments),
-            'valid_segments': len(valid_segments),
-            'finalized_segments': len(finalized),
-            'avg_samples_per_segment': float(avg_samples),
-            'avg_comfort_score': float(avg_comfort),
-            'finalization_rate': float(len(finalized) / len(valid_segments)) if valid_segments else 0.0
+            'total_segments': n,
+            'valid_segments': n_valid,
+            'finalized_segments': n_finalized,
+            'avg_samples_per_segment': avg_samples,
+            'avg_comfort_score': avg_comfort,
+            'finalization_rate': float(n_finalized / n_valid) if n_valid else 0.0
         }
 
 
@@ -7,6 +7,9 @@ Provides TTL-aware storage with 30-day validity.
 
 import json
 import logging
+import threading
+import time
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import pickle
@@ -21,20 +24,35 @@ class CacheManager:
     In production, replace with Redis for distributed caching.
     """
     
-    def __init__(self, backend: str = "memory", ttl_seconds: int = 2592000):
+    def __init__(
+        self,
+        backend: str = "memory",
+        ttl_seconds: int = 2592000,
+        max_entries: int = 1_000_000
+    ):
         """
         Initialize cache manager.
-        
+
         Args:
             backend: "memory" or "redis"
             ttl_seconds: 30 days = 2,592,000 seconds
+            max_entries: LRU bound on cached segments
         """
-        
+
         self.backend = backend
         self.ttl_seconds = ttl_seconds
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        
-        logger.info(f"CacheManager initialized: backend={backend}, ttl={ttl_seconds}s")
+        # TTLCache handles expiry (monotonic timer) and LRU bounding
+        # internally, so lookups are a float compare and cleanup is an
+        # ordered-expiry pop instead of a full scan
+        self.cache: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+
+        # TTLCache is not thread-safe (reads can evict, so even get()
+        # mutates the internal linked list); the aggregator writes
+        # through from ingest threads holding different stripe locks,
+        # so the cache needs its own lock
+        self._lock = threading.Lock()
+
+        logger.info("CacheManager initialized: backend=%s, ttl=%ds", backend, ttl_seconds)
     
     def update_segment(
         self,
@@ -53,13 +71,17 @@ class CacheManager:
             confidence: Average model confidence
         """
         
-        self.cache[segment_id] = {
+        # TTLCache enforces expiry; expires_at_mono is kept alongside so
+        # ISO strings can be produced lazily (see get_all / expires_at_iso)
+        entry = {
             'comfort_score': comfort_score,
             'sample_count': sample_count,
             'confidence': confidence,
-            'cached_at': datetime.utcnow().isoformat(),
-            'expires_at': (datetime.utcnow() + timedelta(seconds=self.ttl_seconds)).isoformat()
+            'cached_at': datetime.utcnow(),
+            'expires_at_mono': time.monotonic() + self.ttl_seconds
         }
+        with self._lock:
+            self.cache[segment_id] = entry
     
     def get_segment(self, segment_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -69,40 +91,35 @@ class CacheManager:
             Cache entry dict or None if expired/not found
         """
         
-        if segment_id not in self.cache:
-            return None
-        
-        entry = self.cache[segment_id]
-        expires_at = datetime.fromisoformat(entry['expires_at'])
-        
-        if datetime.utcnow() > expires_at:
-            del self.cache[segment_id]
-            return None
-        
-        return entry
+        # TTLCache evicts expired entries on access
+        with self._lock:
+            return self.cache.get(segment_id)
+
+    def expires_at_iso(self, entry: Dict[str, Any]) -> str:
+        """Convert an entry's monotonic expiry to an ISO wall-clock string."""
+        remaining = entry['expires_at_mono'] - time.monotonic()
+        return (datetime.utcnow() + timedelta(seconds=remaining)).isoformat()
     
     def clear(self) -> None:
         """Clear entire cache."""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
         logger.info("Cache cleared")
-    
+
     def size(self) -> int:
         """Return number of cached entries."""
-        return len(self.cache)
-    
+        with self._lock:
+            return len(self.cache)
+
     def cleanup_expired(self) -> int:
         """Remove expired entries; return count."""
-        
-        expired_keys = []
-        for key, entry in self.cache.items():
-            expires_at = datetime.fromisoformat(entry['expires_at'])
-            if datetime.utcnow() > expires_at:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        return len(expired_keys)
+
+        # expire() returns None on the pinned cachetools (5.x); the
+        # expired-pairs return value is newer, so count via size delta
+        with self._lock:
+            before = len(self.cache)
+            self.cache.expire()
+            return before - len(self.cache)
     
     def is_available(self) -> bool:
         """Check if cache backend is operational."""
@@ -111,10 +128,15 @@ class CacheManager:
     def get_all(self) -> Dict[str, Dict[str, Any]]:
         """Get all non-expired cache entries."""
         
+        with self._lock:
+            snapshot = list(self.cache.items())
+
         valid = {}
-        for key, entry in self.cache.items():
-            expires_at = datetime.fromisoformat(entry['expires_at'])
-            if datetime.utcnow() <= expires_at:
-                valid[key] = entry
-        
+        for key, entry in snapshot:
+            serialized = dict(entry)
+            serialized['cached_at'] = entry['cached_at'].isoformat()
+            serialized['expires_at'] = self.expires_at_iso(entry)
+            del serialized['expires_at_mono']
+            valid[key] = serialized
+
         return valid
@@ -0,0 +1,82 @@
+"""
+Numba-JIT Kernels for Aggregation Hot Paths
+
+Compiled inner loops for the batch-ingest fold and the bulk score gather
+used by route evaluation. Kernels are warmed with dummy calls at import
+time so the first real request does not pay compile latency.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def fold_batch_into_ring(
+    ring_scores, ring_confs, ring_speeds, ring_headings, ring_ts,
+    head, n, wsum, wxsum, csum,
+    scores, confs, speeds, headings, ts
+):
+    """
+    Fold a batch of samples into a segment's ring buffer, maintaining the
+    incremental weighted sums. Returns the updated
+    (head, n, wsum, wxsum, csum) ring state.
+    """
+    cap = ring_scores.shape[0]
+    for i in range(scores.shape[0]):
+        if n == cap:
+            # Overwriting the oldest sample: drop its contribution
+            old_conf = ring_confs[head]
+            wsum -= old_conf
+            wxsum -= old_conf * ring_scores[head]
+            csum -= old_conf
+
+        ring_scores[head] = scores[i]
+        ring_confs[head] = confs[i]
+        ring_speeds[head] = speeds[i]
+        ring_headings[head] = headings[i]
+        ring_ts[head] = ts
+        head = (head + 1) % cap
+        if n < cap:
+            n += 1
+
+        w = confs[i]
+        wsum += w
+        wxsum += w * scores[i]
+        csum += w
+
+    return head, n, wsum, wxsum, csum
+
+
+@njit(cache=True)
+def gather_scores(score_col, idx, default):
+    """
+    Gather scores for resolved row indices; rows < 0 are unknown and get
+    the default value. Returns (scores, known_mask).
+    """
+    m = idx.shape[0]
+    out = np.empty(m, dtype=np.float32)
+    known = np.empty(m, dtype=np.bool_)
+    for i in range(m):
+        row = idx[i]
+        if row >= 0:
+            out[i] = score_col[row]
+            known[i] = True
+        else:
+            out[i] = default
+            known[i] = False
+    return out, known
+
+
+def _warm_kernels() -> None:
+    """Trigger compilation with minimal dummy inputs."""
+    z32 = np.zeros(1, dtype=np.float32)
+    z64 = np.zeros(1, dtype=np.float64)
+    fold_batch_into_ring(
+        z32.copy(), z32.copy(), z32.copy(), z32.copy(), z64.copy(),
+        0, 0, 0.0, 0.0, 0.0,
+        z32, z32, z32, z32, 0.0
+    )
+    gather_scores(z32, np.zeros(1, dtype=np.int64), np.float32(0.5))
+
+
+_warm_kernels()
@@ -9,19 +9,22 @@ REST API endpoints for:
 - Health check (GET /health)
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import ValidationError
+import msgspec
+import numpy as np
 import uvicorn
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 import yaml
 from pathlib import Path
 
 from models import (
     RoadSegment, VehiclePrediction, SegmentCache,
-    VehiclePredictionRequest, SegmentComfortResponse,
+    IngestRequest, SegmentComfortResponse,
     RouteEvaluationRequest, RouteEvaluationResponse,
     HealthResponse
 )
@@ -35,12 +38,37 @@ logging.basicConfig(level=logging.INFO)
 app = FastAPI(
     title="Road Comfort Analysis API",
     version="1.0.0",
-    description="Hybrid LSTM-RF system for road surface quality and pothole detection"
+    description="Hybrid LSTM-RF system for road surface quality and pothole detection",
+    default_response_class=ORJSONResponse  # orjson: much faster encoding
 )
 
-# Global services
-agg_service = AggregationService(segment_buffer_limit=10, ttl_days=30)
+# Global services; the aggregation service writes through to the cache
+# synchronously on ingest
 cache_mgr = CacheManager()
+agg_service = AggregationService(
+    segment_buffer_limit=10,
+    ttl_days=30,
+    cache_manager=cache_mgr
+)
+
+# Comfort-score color bands: score <= 0.4 red, <= 0.7 yellow, else green
+_COLOR_THRESHOLDS = np.array([0.4, 0.7])
+_COLOR_NAMES = np.array(["red", "yellow", "green"])
+
+
+def score_to_color(score: float) -> str:
+    """Map a single comfort score to its visualization color."""
+    if score > 0.7:
+        return "green"
+    elif score > 0.4:
+        return "yellow"
+    else:
+        return "red"
+
+
+def scores_to_colors(scores: np.ndarray) -> np.ndarray:
+    """Vectorized comfort-score -> color mapping (one searchsorted pass)."""
+    return _COLOR_NAMES[np.searchsorted(_COLOR_THRESHOLDS, scores, side='left')]
 
 
 # ============================================================================
@@ -78,11 +106,13 @@ async def get_stats():
 # Prediction Ingestion Endpoint
 # ============================================================================
 
+# C-implemented decoders, built once at import time
+_ingest_decoder = msgspec.json.Decoder(IngestRequest)
+_batch_decoder = msgspec.json.Decoder(list[IngestRequest])
+
+
 @app.post("/api/v1/predictions")
-async def ingest_prediction(
-    request: VehiclePredictionRequest,
-    background_tasks: BackgroundTasks
-):
+async def ingest_prediction(request: Request):
     """
     Ingest vehicle-level prediction and update segment aggregation.
     
@@ -103,15 +133,23 @@ async def ingest_prediction(
     }
     """
     
+    # Decode with msgspec rather than Pydantic: the endpoint is bound by
+    # validation cost, not aggregation
     try:
-        # Extract fields
-        segment_id = request.segment_id
-        vehicle_id = request.vehicle_id
-        comfort_score = request.prediction.get("comfort_score", 0.5)
-        confidence = request.prediction.get("confidence", 0.5)
-        speed = request.metadata.speed
-        heading = request.metadata.heading
-        
+        payload = _ingest_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Extract fields (typed struct attributes, no dict indirection)
+        segment_id = payload.segment_id
+        vehicle_id = payload.vehicle_id
+        comfort_score = payload.prediction.comfort_score
+        confidence = payload.prediction.confidence
+        speed = payload.metadata.speed
+        heading = payload.metadata.heading
+
         # Ingest to aggregation service
         agg_score, sample_count, is_finalized = agg_service.ingest_prediction(
             segment_id=segment_id,
@@ -121,15 +159,7 @@ async def ingest_prediction(
             speed=speed,
             heading=heading
         )
-        
-        # Schedule cache update (non-blocking)
-        background_tasks.add_task(
-            cache_mgr.update_segment,
-            segment_id=segment_id,
-            comfort_score=agg_score,
-            sample_count=sample_count
-        )
-        
+
         return {
             "status": "accepted",
             "segment_id": segment_id,
@@ -139,14 +169,86 @@ async def ingest_prediction(
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    except ValidationError as e:
-        logger.error(f"Validation error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Ingestion error: {e}")
+        logger.error("Ingestion error: %s", e)
         raise HTTPException(status_code=500, detail="Internal error during prediction ingestion")
 
 
+@app.post("/api/v1/predictions/batch")
+async def ingest_predictions_batch(request: Request):
+    """
+    Ingest a batch of vehicle predictions in one request.
+
+    Request body: JSON array of the same objects accepted by
+    POST /api/v1/predictions. Amortizes HTTP, validation and lock
+    overhead across the batch; samples are grouped by segment and each
+    segment's buffer is updated under a single lock acquisition.
+    """
+
+    try:
+        payloads = _batch_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Group samples by segment
+        grouped: Dict[str, list] = defaultdict(list)
+        for p in payloads:
+            grouped[p.segment_id].append(p)
+
+        results = []
+        for segment_id, group in grouped.items():
+            scores = np.fromiter(
+                (p.prediction.comfort_score for p in group),
+                dtype=np.float32, count=len(group)
+            )
+            confs = np.fromiter(
+                (p.prediction.confidence for p in group),
+                dtype=np.float32, count=len(group)
+            )
+            speeds = np.fromiter(
+                (p.metadata.speed for p in group),
+                dtype=np.float32, count=len(group)
+            )
+            headings = np.fromiter(
+                (p.metadata.heading for p in group),
+                dtype=np.float32, count=len(group)
+            )
+            vehicle_ids = [p.vehicle_id for p in group]
+
+            agg_score, sample_count, is_finalized = agg_service.ingest_batch(
+                segment_id=segment_id,
+                comfort_scores=scores,
+                confidences=confs,
+                vehicle_ids=vehicle_ids,
+                speeds=speeds,
+                headings=headings
+            )
+
+            results.append({
+                "segment_id": segment_id,
+                "aggregated_score": agg_score,
+                "sample_count": sample_count,
+                "is_finalized": is_finalized
+            })
+
+        return {
+            "status": "accepted",
+            "accepted_count": len(payloads),
+            "segments": results,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Ingestion error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal error during batch ingestion")
+
+
 # ============================================================================
 # Query Endpoints
 # ============================================================================
@@ -167,28 +269,26 @@ async def get_segment_comfort(segment_id: str):
     }
     """
     
-    # Try cache first
+    # Try cache first (ISO timestamps are formatted lazily, only here)
     cached = cache_mgr.get_segment(segment_id)
     if cached:
-        return cached
-    
+        return SegmentComfortResponse(
+            segment_id=segment_id,
+            comfort_score=cached['comfort_score'],
+            sample_count=cached['sample_count'],
+            last_updated=cached['cached_at'].isoformat(),
+            expires_at=cache_mgr.expires_at_iso(cached),
+            color=score_to_color(cached['comfort_score'])
+        )
+
     # Fall back to aggregation service
     segment_data = agg_service.get_segment_score(segment_id)
     if not segment_data:
         raise HTTPException(status_code=404, detail=f"Segment {segment_id} not found")
-    
+
     # Format response
     comfort_score = segment_data['comfort_score']
-    
-    def score_to_color(score: float) -> str:
-        """Map comfort score to visualization color."""
-        if score > 0.7:
-            return "green"
-        elif score > 0.4:
-            return "yellow"
-        else:
-            return "red"
-    
+
     response = SegmentComfortResponse(
         segment_id=segment_id,
         comfort_score=comfort_score,
@@ -212,32 +312,37 @@ async def list_segments(
         include_invalid=not valid_only,
         include_finalized_only=finalized_only
     )
-    
-    def score_to_color(score: float) -> str:
-        if score > 0.7:
-            return "green"
-        elif score > 0.4:
-            return "yellow"
-        else:
-            return "red"
-    
-    results = [
-        SegmentComfortResponse(
-            segment_id=seg['segment_id'],
-            comfort_score=seg['comfort_score'],
-            sample_count=seg['sample_count'],
-            last_updated=seg['last_updated'].isoformat(),
-            expires_at=seg['expires_at'].isoformat() if seg['expires_at'] else None,
-            color=score_to_color(seg['comfort_score'])
-        )
-        for seg in segments
-    ]
-    
+
+    # Vectorized color banding: one searchsorted call for all segments
+    # instead of a branchy per-segment closure
+    scores = np.fromiter(
+        (seg['comfort_score'] for seg in segments),
+        dtype=np.float64,
+        count=len(segments)
+    )
+    colors = scores_to_colors(scores)
+
+    # Hot path: raw dicts straight into orjson (no Pydantic round-trip;
+    # orjson serializes datetimes natively). Single pass, preallocated.
+    results = [None] * len(segments)
+    cached_count = 0
+    for i, seg in enumerate(segments):
+        if seg['is_valid']:
+            cached_count += 1
+        results[i] = {
+            "segment_id": seg['segment_id'],
+            "comfort_score": seg['comfort_score'],
+            "sample_count": seg['sample_count'],
+            "last_updated": seg['last_updated'],
+            "expires_at": seg['expires_at'],
+            "color": str(colors[i])
+        }
+
     return {
         "segments": results,
         "total_count": len(segments),
-        "cached_count": len([s for s in segments if s['is_valid']]),
-        "expired_count": len([s for s in segments if not s['is_valid']])
+        "cached_count": cached_count,
+        "expired_count": len(segments) - cached_count
     }
 
 
@@ -259,45 +364,38 @@ async def evaluate_route(request: RouteEvaluationRequest):
     segments = request.segments
     time_weight = request.time_weight
     comfort_weight = request.comfort_weight
-    
-    segment_details = []
-    total_comfort_cost = 0.0
-    total_time_cost = 0.0
-    comfort_scores = []
-    
-    for segment_id in segments:
-        segment_data = agg_service.get_segment_score(segment_id)
-        
-        if segment_data:
-            comfort_score = segment_data['comfort_score']
-            comfort_cost = 1.0 - comfort_score  # Inverse: lower score -> higher cost
-        else:
-            comfort_score = 0.5  # Unknown, neutral
-            comfort_cost = 0.5
-        
-        # Time cost (simplified; assumes unit distance)
-        time_cost = 1.0  # Placeholder
-        
-        comfort_scores.append(comfort_score)
-        total_comfort_cost += comfort_cost
-        total_time_cost += time_cost
-        
-        segment_details.append({
-            "segment_id": segment_id,
-            "comfort_score": comfort_score,
-            "comfort_cost": comfort_cost,
-            "time_cost": time_cost,
-            "known": segment_data is not None
-        })
-    
-    # Normalize costs
-    n_segments = len(segments) if segments else 1
-    avg_time_cost = total_time_cost / n_segments
-    avg_comfort_cost = total_comfort_cost / n_segments
-    
+
+    # Single bulk lookup + NumPy reductions instead of a per-segment
+    # Python loop of dict rebuilds
+    comfort_scores, known = agg_service.get_scores_bulk(segments)
+    comfort_costs = 1.0 - comfort_scores
+
+    # Time cost (simplified; assumes unit distance)
+    time_cost = 1.0  # Placeholder
+
+    if segments:
+        avg_time_cost = time_cost
+        avg_comfort_cost = float(comfort_costs.mean())
+        avg_comfort = float(comfort_scores.mean())
+    else:
+        avg_time_cost = 0.0
+        avg_comfort_cost = 0.0
+        avg_comfort = 0.5
+
     # Weighted total cost
     total_cost = (avg_time_cost * time_weight) + (avg_comfort_cost * comfort_weight)
-    avg_comfort = (sum(comfort_scores) / len(comfort_scores)) if comfort_scores else 0.5
+
+    segment_details = [
+        {
+            "segment_id": segment_id,
+            "comfort_score": float(score),
+            "comfort_cost": float(cost),
+            "time_cost": time_cost,
+            "known": bool(is_known)
+        }
+        for segment_id, score, cost, is_known
+        in zip(segments, comfort_scores, comfort_costs, known)
+    ]
     
     return RouteEvaluationResponse(
         total_cost=total_cost,
@@ -367,7 +465,7 @@ async def validation_exception_handler(request, exc):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    logger.error(f"Unhandled exception: {exc}")
+    logger.error("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
@@ -381,8 +479,8 @@ async def general_exception_handler(request, exc):
 @app.on_event("startup")
 async def startup_event():
     logger.info("Road Comfort API starting up...")
-    logger.info(f"Aggregation service initialized")
-    logger.info(f"Cache manager initialized")
+    logger.info("Aggregation service initialized")
+    logger.info("Cache manager initialized")
 
 
 @app.on_event("shutdown")
@@ -392,10 +490,20 @@ async def shutdown_event():
 
 
 if __name__ == "__main__":
-    # Run server
+    # Run server. uvloop + httptools replace the default asyncio loop and
+    # h11 parser, which sit on the hot path of every small-body ingest
+    # POST. workers must stay at 1: AggregationService and CacheManager
+    # are per-process in-memory state, so with N workers each ingest
+    # lands in one worker while reads are served by whichever worker
+    # accepts the connection — nondeterministic 404s and stale scores.
+    # Scale out only once the aggregation state lives in a shared store
+    # (e.g. Redis).
     uvicorn.run(
-        app,
+        "main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=1,
         log_level="info"
     )
@@ -5,14 +5,33 @@ SQLAlchemy ORM models for segment data, predictions, and cache.
 Pydantic schemas for API request/response validation.
 """
 
-from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean, JSON
+import msgspec
+import xxhash
+from sqlalchemy import BigInteger, Column, Integer, Float, String, DateTime, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 Base = declarative_base()
 
+# JSONB on Postgres (binary storage, no re-parse on read, GIN-indexable);
+# plain JSON elsewhere (tests run on SQLite)
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
+
+def segment_key_for(segment_id: str) -> int:
+    """
+    Stable 64-bit surrogate key for a segment-id string.
+
+    Indexes on an 8-byte integer are 2-3x smaller than on variable-length
+    text and compare in one instruction. xxh64 is unsigned; the result is
+    wrapped into signed range so it fits a BIGINT column.
+    """
+    digest = xxhash.xxh64_intdigest(segment_id.encode('utf-8'))
+    return digest - (1 << 64) if digest >= (1 << 63) else digest
+
 
 # ============================================================================
 # SQLAlchemy ORM Models
@@ -23,6 +42,7 @@ class RoadSegment(Base):
     Road segment entity with cached comfort score.
     
     Attributes:
+        segment_key: 64-bit surrogate of segment_id (hot lookup key)
         segment_id: Unique segment identifier (from map-matching)
         latitude, longitude: Segment center coordinates
         comfort_score: Aggregated comfort score in [0, 1]
@@ -32,16 +52,29 @@ class RoadSegment(Base):
     """
     
     __tablename__ = "road_segments"
-    
+
+    # GIN index makes metadata key filters (e.g. road_type) index lookups;
+    # the plain expires_at index below covers the TTL eviction scan (a
+    # partial index can't: Postgres requires IMMUTABLE predicates and
+    # now() is only STABLE)
+    __table_args__ = (
+        Index('ix_road_segments_meta', 'metadata', postgresql_using='gin'),
+    )
+
     id = Column(Integer, primary_key=True)
-    segment_id = Column(String, unique=True, nullable=False, index=True)
+    # Hot lookup key: xxh64 of segment_id (see segment_key_for); the
+    # string form is kept as an unindexed display column
+    segment_key = Column(BigInteger, unique=True, nullable=False, index=True)
+    segment_id = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     comfort_score = Column(Float, default=0.5)  # [0, 1]
     sample_count = Column(Integer, default=0)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     expires_at = Column(DateTime, nullable=True, index=True)
-    metadata = Column(JSON, default={})  # Extra context (road type, weather, etc.)
+    # "metadata" is reserved by the declarative API; keep the column name.
+    # default=dict, not {}: a literal default is shared across rows.
+    extra = Column("metadata", JSONVariant, default=dict, nullable=False)  # Extra context (road type, weather, etc.)
     
     def __repr__(self):
         return f"<RoadSegment {self.segment_id}: score={self.comfort_score:.2f}, n={self.sample_count}>"
@@ -62,48 +95,91 @@ class VehiclePrediction(Base):
     """
     
     __tablename__ = "vehicle_predictions"
-    
+
+    # Composite indexes cover the hot access paths (per-segment history,
+    # per-vehicle latest prediction) as single index range scans
+    __table_args__ = (
+        Index('ix_vp_seg_ts', 'segment_key', 'timestamp'),
+        Index('ix_vp_veh_ts', 'vehicle_id', 'timestamp'),
+    )
+
     id = Column(Integer, primary_key=True)
-    segment_id = Column(String, nullable=False, index=True)
-    vehicle_id = Column(String, nullable=False, index=True)
+    segment_key = Column(BigInteger, nullable=False)
+    segment_id = Column(String, nullable=False)
+    vehicle_id = Column(String, nullable=False)
     comfort_score = Column(Float, nullable=False)
     pothole_detected = Column(Boolean, default=False)
     confidence = Column(Float, nullable=False)
     speed = Column(Float, nullable=True)
     heading = Column(Float, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    metadata = Column(JSON, default={})
+    extra = Column("metadata", JSONVariant, default=dict, nullable=False)
     
     def __repr__(self):
         return f"<VehiclePrediction {self.vehicle_id} @ {self.segment_id}>"
 
 
+def _default_expires_at(context) -> datetime:
+    """Compute expires_at from the row's own cached_at and ttl_seconds."""
+    params = context.get_current_parameters()
+    cached_at = params.get('cached_at') or datetime.utcnow()
+    ttl = params.get('ttl_seconds') or 2592000
+    return cached_at + timedelta(seconds=ttl)
+
+
 class SegmentCache(Base):
     """
     Cached segment comfort scores for fast retrieval.
     
     Attributes:
-        segment_id: Road segment ID
+        segment_key: 64-bit surrogate of segment_id (primary key)
+        segment_id: Road segment ID (display form)
         comfort_score: Cached aggregated score
         sample_count: Number of contributing samples
         confidence: Average model confidence
         cached_at: Timestamp when cache was last updated
         ttl_seconds: Time-to-live (30 days = 2,592,000 seconds)
+        expires_at: cached_at + ttl, filled in on insert/update; indexed
+            so bulk eviction is one DELETE over an index range instead of
+            fetching rows and checking is_valid() in Python
     """
     
     __tablename__ = "segment_cache"
     
-    segment_id = Column(String, primary_key=True, index=True)
+    segment_key = Column(BigInteger, primary_key=True)
+    segment_id = Column(String, nullable=False)
     comfort_score = Column(Float, nullable=False)
     sample_count = Column(Integer, default=0)
     confidence = Column(Float, default=0.0)
-    cached_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexed for the bulk TTL eviction scan (cached_at + ttl < now)
+    cached_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     ttl_seconds = Column(Integer, default=2592000)  # 30 days
-    
+    # Materialized on write (see _default_expires_at) so the expiry
+    # predicate runs in the engine as an index range scan rather than
+    # per-row Python datetime math. Not a generated column: Postgres
+    # requires IMMUTABLE generation expressions and interval casts are
+    # only STABLE, and SQLite rejects the ::interval syntax entirely.
+    expires_at = Column(
+        DateTime,
+        default=_default_expires_at,
+        onupdate=_default_expires_at,
+        index=True
+    )
+
     def is_valid(self) -> bool:
         """Check if cache entry has expired."""
         elapsed = (datetime.utcnow() - self.cached_at).total_seconds()
         return elapsed < self.ttl_seconds
+
+    @classmethod
+    def purge_expired(cls, session) -> int:
+        """Delete all expired entries with one set-based statement."""
+        removed = (
+            session.query(cls)
+            .filter(cls.expires_at < datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+        return removed
     
     def __repr__(self):
         return f"<SegmentCache {self.segment_id}: {self.comfort_score:.2f} @ {self.cached_at}>"
@@ -152,6 +228,38 @@ class VehiclePredictionRequest(BaseModel):
         }
 
 
+# ----------------------------------------------------------------------------
+# msgspec structs for the ingest hot path (C-implemented decoding; avoids
+# the Pydantic validation cost on every POST /api/v1/predictions)
+# ----------------------------------------------------------------------------
+
+class IngestPrediction(msgspec.Struct):
+    """Typed model output: float fields instead of a free-form dict."""
+
+    comfort_score: float = 0.5
+    pothole_detected: bool = False
+    confidence: float = 0.5
+
+
+class IngestMetadata(msgspec.Struct):
+    """Vehicle context at time of prediction."""
+
+    speed: float
+    heading: float
+    timestamp: str
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+
+
+class IngestRequest(msgspec.Struct):
+    """Request body for POST /api/v1/predictions (hot path)."""
+
+    segment_id: str
+    vehicle_id: str
+    prediction: IngestPrediction
+    metadata: IngestMetadata
+
+
 class SegmentComfortResponse(BaseModel):
     """Response body for GET /api/v1/segments/{segment_id}."""
     
@@ -0,0 +1,102 @@
+"""
+Batched Prediction Audit Log
+
+Buffers VehiclePrediction rows in memory and flushes them with multi-row
+inserts. One row per ingest request with autocommit is the classic
+single-row-insert anti-pattern; batching amortizes the round-trip,
+parsing, and fsync cost over hundreds of rows.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from models import VehiclePrediction, segment_key_for
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionLog:
+    """
+    Size- and age-triggered batch writer for the prediction audit log.
+
+    Ingest handlers append dicts shaped for the vehicle_predictions
+    table; the buffer is flushed as one multi-row INSERT when it reaches
+    max_rows or its oldest entry exceeds max_age_seconds. Appends are
+    O(1) under a lock; only the flusher touches the database.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_rows: int = 500,
+        max_age_seconds: float = 0.2
+    ):
+        """
+        Initialize the batch writer.
+
+        Args:
+            engine: SQLAlchemy engine bound to the ingest database
+            max_rows: flush when this many rows are buffered
+            max_age_seconds: flush when the oldest buffered row is older
+        """
+
+        self.engine = engine
+        self.max_rows = max_rows
+        self.max_age_seconds = max_age_seconds
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._oldest_mono: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Buffer one prediction row, flushing if a trigger fires."""
+        if 'segment_key' not in row:
+            row['segment_key'] = segment_key_for(row['segment_id'])
+        now_mono = time.monotonic()
+        with self._lock:
+            if self._oldest_mono is None:
+                self._oldest_mono = now_mono
+            self._buffer.append(row)
+            should_flush = (
+                len(self._buffer) >= self.max_rows
+                or now_mono - self._oldest_mono >= self.max_age_seconds
+            )
+            if not should_flush:
+                return
+            rows = self._take_locked()
+
+        self._write(rows)
+
+    def flush(self) -> int:
+        """Flush any buffered rows (shutdown / periodic task hook)."""
+        with self._lock:
+            rows = self._take_locked()
+        if rows:
+            self._write(rows)
+        return len(rows)
+
+    def _take_locked(self) -> List[Dict[str, Any]]:
+        """Detach the current buffer. Caller must hold the lock."""
+        rows = self._buffer
+        self._buffer = []
+        self._oldest_mono = None
+        return rows
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Issue one multi-row INSERT for a detached batch."""
+        if not rows:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(VehiclePrediction.__table__.insert(), rows)
+            logger.debug("Flushed %d prediction rows", len(rows))
+        except Exception:
+            # Audit log writes must not take down the ingest path
+            logger.exception("Failed to flush %d prediction rows", len(rows))
+
+    def pending(self) -> int:
+        """Return the number of buffered rows."""
+        with self._lock:
+            return len(self._buffer)
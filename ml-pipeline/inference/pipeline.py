@@ -6,15 +6,117 @@ Handles preprocessing, embedding extraction, classification, and confidence scor
 """
 
 import numpy as np
+import scipy.fft
 import torch
 import joblib
+from numba import njit
 from pathlib import Path
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, fastmath=True)
+def _time_stats(accel, mag, out):
+    """
+    One fused sweep per window computing the statistical feature block.
+
+    Fills mag[b, t] with the acceleration magnitude and out[b, :9] with
+    [mean_x, std_x, mean_y, std_y, mean_z, std_z, mean_mag, std_mag,
+    rms_mag]. Replaces ~10 separate NumPy reductions (each a full pass
+    with dispatch overhead) with a single compiled loop.
+    """
+    num_windows, num_samples, _ = accel.shape
+    inv_n = 1.0 / num_samples
+    for b in range(num_windows):
+        s0 = s1 = s2 = 0.0
+        q0 = q1 = q2 = 0.0
+        ms = 0.0
+        mq = 0.0
+        for t in range(num_samples):
+            a0 = accel[b, t, 0]
+            a1 = accel[b, t, 1]
+            a2 = accel[b, t, 2]
+            s0 += a0
+            s1 += a1
+            s2 += a2
+            q0 += a0 * a0
+            q1 += a1 * a1
+            q2 += a2 * a2
+            m = np.sqrt(a0 * a0 + a1 * a1 + a2 * a2)
+            mag[b, t] = m
+            ms += m
+            mq += m * m
+
+        m0 = s0 * inv_n
+        m1 = s1 * inv_n
+        m2 = s2 * inv_n
+        mm = ms * inv_n
+        out[b, 0] = m0
+        out[b, 1] = np.sqrt(max(q0 * inv_n - m0 * m0, 0.0))
+        out[b, 2] = m1
+        out[b, 3] = np.sqrt(max(q1 * inv_n - m1 * m1, 0.0))
+        out[b, 4] = m2
+        out[b, 5] = np.sqrt(max(q2 * inv_n - m2 * m2, 0.0))
+        out[b, 6] = mm
+        out[b, 7] = np.sqrt(max(mq * inv_n - mm * mm, 0.0))
+        out[b, 8] = np.sqrt(mq * inv_n)
+
+
+@njit(cache=True, fastmath=True)
+def _mag_temporal(mag, mean, out):
+    """
+    One sweep per magnitude signal computing the temporal feature block.
+
+    Fills out[b, :4] with [peak_count, max, min, zero_crossing_rate]
+    given each window's precomputed mean. Replaces the three boolean
+    comparison arrays of the peak test and the sign/diff temporaries of
+    the zero-crossing rate (~8 allocations per call).
+    """
+    num_windows, num_samples = mag.shape
+    for b in range(num_windows):
+        mu = mean[b]
+        mn = mag[b, 0]
+        mx = mag[b, 0]
+        peaks = 0
+        crossings = 0
+        v0 = mag[b, 0] - mu
+        prev_sign = 1 if v0 > 0 else (-1 if v0 < 0 else 0)
+        for t in range(num_samples):
+            v = mag[b, t]
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+            if 0 < t < num_samples - 1:
+                if mag[b, t] > mag[b, t - 1] and mag[b, t] > mag[b, t + 1]:
+                    peaks += 1
+            d = v - mu
+            s = 1 if d > 0 else (-1 if d < 0 else 0)
+            if t > 0 and s != prev_sign:
+                crossings += 1
+            prev_sign = s
+        out[b, 0] = peaks
+        out[b, 1] = mx
+        out[b, 2] = mn
+        out[b, 3] = crossings / num_samples
+
+
+def _warm_kernels() -> None:
+    """Trigger compilation with minimal dummy inputs."""
+    z = np.zeros((1, 3, 3))
+    # The real calls write into strided float32 slices of the feature
+    # matrix; warm those signatures
+    feat = np.zeros((1, 21), dtype=np.float32)
+    mag = np.zeros((1, 3), dtype=np.float32)
+    _time_stats(z, mag, feat[:, :9])
+    _mag_temporal(mag, feat[:, 6], feat[:, 14:18])
+
+
+_warm_kernels()
+
+
 class RoadComfortPipeline:
     """
     End-to-end inference pipeline for road comfort analysis.
@@ -25,45 +127,147 @@ class RoadComfortPipeline:
     3. Feature engineering → handcrafted features
     4. Random Forest → comfort score + pothole prediction
     """
-    
+
+    # Width of the handcrafted feature vector
+    NUM_HANDCRAFTED = 21
+
+
     def __init__(
         self,
         lstm_encoder_path: str,
         rf_classifier_path: str,
         scaler_path: str,
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        sequence_length: int = 300,
+        max_batch: int = 256
     ):
         """
         Initialize pipeline with pre-trained models.
-        
+
         Args:
             lstm_encoder_path: Path to LSTM encoder weights
             rf_classifier_path: Path to Random Forest model
             scaler_path: Path to feature scaler
             device: torch device (cuda or cpu)
+            sequence_length: samples per sensor window (3 s at 100 Hz)
+            max_batch: largest batch served from the preallocated scratch
         """
         self.device = device
-        
+
         # Load LSTM encoder
         self.lstm_encoder = self._load_lstm_encoder(lstm_encoder_path)
         self.lstm_encoder.to(device)
         self.lstm_encoder.eval()
-        
+
         # Load Random Forest and scaler
         self.rf_classifier = joblib.load(rf_classifier_path)
         self.scaler = joblib.load(scaler_path)
-        
+
+        # StandardScaler.transform is just (x - mean_) / scale_ behind
+        # input validation and a copy; fold it to cached FP32 vectors and
+        # apply the arithmetic directly on the feature matrix
+        self._sc_mean = self.scaler.mean_.astype(np.float32)
+        self._sc_inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+
+        # Compile the forest into a batched ONNX graph: tree traversal
+        # becomes vectorized tensor ops on FP32 input instead of sklearn's
+        # branchy per-tree float64 walk, and one run() returns both label
+        # and probabilities. Optional dependency; sklearn is the fallback.
+        self._rf_session = None
+        self._rf_input_name = None
+        try:
+            from hummingbird.ml import convert
+            import onnxruntime as ort
+
+            # The ONNX backend traces the model, so it needs a concrete
+            # sample input; its shape fixes the graph's batch size.
+            onnx_model = convert(
+                self.rf_classifier, 'onnx',
+                test_input=np.zeros(
+                    (max_batch, self._sc_mean.shape[0]), dtype=np.float32
+                )
+            ).model
+            self._rf_session = ort.InferenceSession(
+                onnx_model.SerializeToString(),
+                providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
+            )
+            self._rf_input_name = self._rf_session.get_inputs()[0].name
+            logger.info("Random Forest compiled to ONNX")
+        except Exception as e:
+            logger.warning("RF ONNX compilation unavailable (%s); using sklearn", e)
+
+        # Window length is fixed, so the rFFT frequency grid is built once
+        # here. The grid is monotonic, so band queries reduce to contiguous
+        # slices (searchsorted bounds) instead of boolean-mask gathers:
+        # bin 0 is DC, [1:i5) is 0-5 Hz, and so on.
+        self._num_samples = sequence_length
+        self._freqs = np.fft.rfftfreq(sequence_length, 1.0 / 100)  # 100 Hz sampling
+        self._i5 = int(np.searchsorted(self._freqs, 5))
+        self._i15 = int(np.searchsorted(self._freqs, 15))
+        self._i30 = int(np.searchsorted(self._freqs, 30, side='right'))
+        # "Positive" bins exclude DC and, for even window lengths, the
+        # Nyquist bin (fftfreq labels it negative, so the original
+        # freqs > 0 mask dropped it); centroid/bandwidth match that.
+        self._pos_end = 1 + (sequence_length - 1) // 2
+        self._freqs_pos = self._freqs[1:self._pos_end]
+
+        # Preprocessing scratch: windows are normalized in place into this
+        # buffer, and the torch tensor shares its memory, so a prediction
+        # does no preprocessing allocations and a single host->device copy.
+        # On CUDA the scratch is pinned and paired with a resident device
+        # buffer plus a dedicated stream, so the H2D copy is async and the
+        # encoder launch can overlap CPU-side feature extraction.
+        self._max_batch = max_batch
+        if str(device).startswith("cuda"):
+            self._scratch_tensor = torch.empty(
+                (max_batch, sequence_length, 6), dtype=torch.float32, pin_memory=True
+            )
+            self._scratch = self._scratch_tensor.numpy()
+            # Device buffer matches the FP16 encoder; copy_ from the
+            # pinned FP32 scratch casts during the transfer
+            self._encoder_dtype = torch.float16
+            self._gpu_input = torch.empty(
+                (max_batch, sequence_length, 6), dtype=self._encoder_dtype, device=device
+            )
+            self._stream = torch.cuda.Stream(device=device)
+        else:
+            self._encoder_dtype = torch.float32
+            self._scratch = np.empty((max_batch, sequence_length, 6), dtype=np.float32)
+            self._scratch_tensor = torch.from_numpy(self._scratch)
+            self._gpu_input = None
+            self._stream = None
+
+        # Handcrafted features are written straight into this matrix
+        # instead of a per-call Python list of boxed floats
+        self._feat_out = np.empty((max_batch, self.NUM_HANDCRAFTED), dtype=np.float32)
+
         logger.info(f"Pipeline initialized on {device}")
     
     def _load_lstm_encoder(self, path: str):
-        """Load LSTM encoder from checkpoint."""
+        """Load LSTM encoder from checkpoint and compile it for inference."""
         # This assumes encoder.pth or similar format
         # Adjust based on actual model serialization format
-        import torch.nn as nn
-        
-        # Placeholder: actual loading depends on model structure
         logger.info(f"Loading LSTM encoder from {path}")
-        return torch.load(path, map_location=self.device)
+        model = torch.load(path, map_location=self.device)
+        model.eval()
+
+        # FP16 weights on GPU: the LSTM is bandwidth-bound on its weight
+        # matrices, so halving bytes read roughly doubles throughput.
+        # Embeddings are cast back to FP32 before the RF stage.
+        if str(self.device).startswith("cuda"):
+            model = model.to(self.device).half()
+
+        # TorchScript removes the per-layer Python dispatch and lets the
+        # runtime use the fused LSTM path (cuDNN on GPU, MKLDNN on CPU);
+        # fall back to the eager module if the checkpoint can't be scripted
+        try:
+            scripted = torch.jit.script(model)
+            scripted = torch.jit.freeze(scripted)
+            scripted = torch.jit.optimize_for_inference(scripted)
+            return scripted
+        except Exception as e:
+            logger.warning("TorchScript compilation failed (%s); using eager model", e)
+            return model
     
     def predict(
         self,
@@ -72,148 +276,224 @@ class RoadComfortPipeline:
         heading: float = 0.0
     ) -> Dict[str, Any]:
         """
-        Run full inference pipeline on sensor window.
-        
+        Run full inference pipeline on a single sensor window.
+
+        Thin wrapper over predict_batch with B=1.
+
         Args:
             sensor_window: [sequence_length, 6] with [ax, ay, az, gx, gy, gz]
             speed: vehicle speed m/s
             heading: vehicle heading degrees
-        
+
         Returns:
             Dict with keys:
             - 'pothole': bool (detected or not)
             - 'comfort_score': float in [0, 1]
             - 'confidence': float in [0, 1]
             - 'embedding': np.ndarray shape (64,)
-            - 'features': np.ndarray shape (88,)
+            - 'features': np.ndarray shape (85,)
         """
-        
-        # Step 1: Preprocess
-        window_processed = self._preprocess_window(sensor_window)
-        
-        # Step 2: LSTM encoding
-        with torch.no_grad():
-            X_tensor = torch.FloatTensor(window_processed).unsqueeze(0).to(self.device)
-            embedding = self.lstm_encoder(X_tensor).cpu().numpy()[0]
-        
-        # Step 3: Handcrafted features
-        handcrafted = self._extract_handcrafted_features(sensor_window, speed, heading)
-        
-        # Step 4: Combine features and normalize
-        X_combined = np.concatenate([embedding, handcrafted])
-        X_scaled = self.scaler.transform([X_combined])[0]
-        
-        # Step 5: Random Forest inference
-        logits = self.rf_classifier.predict([X_scaled])[0]
-        probs = self.rf_classifier.predict_proba([X_scaled])[0]
-        
-        # Decode predictions
-        pothole_detected = bool(logits == 1)
-        confidence = float(np.max(probs))
-        
-        # Comfort score: derived from pothole confidence
-        # If pothole confidence high -> comfort score low
-        pothole_confidence = probs[1] if len(probs) > 1 else 0
-        comfort_score = 1.0 - pothole_confidence
-        
-        result = {
-            'pothole': pothole_detected,
-            'comfort_score': comfort_score,
-            'confidence': confidence,
-            'embedding': embedding,
-            'features': X_combined,
-            'pothole_confidence': pothole_confidence
-        }
-        
-        return result
-    
-    def _preprocess_window(self, window: np.ndarray) -> np.ndarray:
+
+        return self.predict_batch(
+            sensor_window[None, :, :],
+            np.array([speed]),
+            np.array([heading])
+        )[0]
+
+    def predict_batch(
+        self,
+        sensor_windows: np.ndarray,
+        speeds: Optional[np.ndarray] = None,
+        headings: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the full inference pipeline on a batch of sensor windows.
+
+        One LSTM forward pass and one Random Forest call for all windows:
+        CUDA launch and sklearn per-call overhead are amortized over the
+        batch instead of being paid per window.
+
+        Args:
+            sensor_windows: [batch, sequence_length, 6]
+            speeds: per-window vehicle speeds m/s (default zeros)
+            headings: per-window headings degrees (default zeros)
+
+        Returns:
+            List of per-window result dicts (same keys as predict)
         """
-        Preprocess sensor window.
-        
+
+        windows = np.asarray(sensor_windows)
+        batch_size = windows.shape[0]
+        if speeds is None:
+            speeds = np.zeros(batch_size)
+        if headings is None:
+            headings = np.zeros(batch_size)
+
+        # Step 1: Preprocess (whole batch)
+        batch_processed = self._preprocess_window(windows)
+
+        # Steps 2+3: LSTM encoding and handcrafted features. On CUDA the
+        # copy and forward pass run on the side stream while the CPU
+        # extracts handcrafted features; the sync happens only when the
+        # embeddings are actually needed.
+        if self._stream is not None and batch_size <= self._max_batch:
+            with torch.inference_mode():
+                with torch.cuda.stream(self._stream):
+                    gpu_input = self._gpu_input[:batch_size]
+                    gpu_input.copy_(self._scratch_tensor[:batch_size], non_blocking=True)
+                    embeddings_t = self.lstm_encoder(gpu_input)
+                handcrafted = self._extract_handcrafted_features(windows, speeds, headings)
+                self._stream.synchronize()
+                embeddings = embeddings_t.float().cpu().numpy()
+        else:
+            with torch.inference_mode():
+                X_tensor = torch.from_numpy(batch_processed).to(
+                    self.device, dtype=self._encoder_dtype, non_blocking=True
+                )
+                embeddings = self.lstm_encoder(X_tensor).float().cpu().numpy()
+            handcrafted = self._extract_handcrafted_features(windows, speeds, headings)
+
+        # Step 4: Combine features and normalize (cached scaler vectors;
+        # X_combined stays unscaled for the result dicts)
+        X_combined = np.concatenate([embeddings, handcrafted], axis=1)
+        X_scaled = X_combined - self._sc_mean
+        X_scaled *= self._sc_inv_scale
+
+        # Step 5: Random Forest inference, one traversal for the batch
+        labels, probs = self._rf_predict(X_scaled)
+
+        # Decode predictions per window
+        results = []
+        for i in range(batch_size):
+            pothole_detected = bool(labels[i] == 1)
+            confidence = float(np.max(probs[i]))
+
+            # Comfort score: derived from pothole confidence
+            # If pothole confidence high -> comfort score low
+            pothole_confidence = float(probs[i][1]) if probs.shape[1] > 1 else 0.0
+            comfort_score = 1.0 - pothole_confidence
+
+            results.append({
+                'pothole': pothole_detected,
+                'comfort_score': comfort_score,
+                'confidence': confidence,
+                'embedding': embeddings[i],
+                'features': X_combined[i],
+                'pothole_confidence': pothole_confidence
+            })
+
+        return results
+
+    def _rf_predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the forest on a batch, returning (labels, probabilities)."""
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        if self._rf_session is not None:
+            # One ONNX run yields both outputs; no second traversal
+            labels, probs = self._rf_session.run(None, {self._rf_input_name: X32})
+            return np.asarray(labels), np.asarray(probs)
+
+        # sklearn's predict() is classes_[argmax(predict_proba(X))]; doing
+        # the argmax ourselves halves the tree traversals
+        probs = self.rf_classifier.predict_proba(X32)
+        labels = self.rf_classifier.classes_[np.argmax(probs, axis=1)]
+        return labels, probs
+
+    def _preprocess_window(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Preprocess a batch of sensor windows [batch, T, 6].
+
         Steps:
         - Remove gravity via filtering
         - Resample if needed
         - Normalize
         """
-        
-        # Remove gravity (simple high-pass filter on accel)
-        accel = window[:, :3]
-        accel_filtered = accel - np.mean(accel, axis=0)  # Remove DC offset
-        
+
+        batch_size = windows.shape[0]
+        if batch_size <= self._max_batch:
+            out = self._scratch[:batch_size]
+        else:
+            # Oversized batch: fall back to a one-off allocation
+            out = np.empty(windows.shape, dtype=np.float32)
+
+        # Remove gravity (simple high-pass filter on accel), in place
+        accel = windows[:, :, :3]
+        np.subtract(accel, np.mean(accel, axis=1, keepdims=True), out=out[:, :, :3])
+
         # Normalize to [-1, 1] per axis
-        accel_norm_max = np.max(np.abs(accel_filtered), axis=0, keepdims=True)
+        accel_norm_max = np.max(np.abs(out[:, :, :3]), axis=1, keepdims=True)
         accel_norm_max[accel_norm_max == 0] = 1.0  # Avoid division by zero
-        accel_normalized = accel_filtered / accel_norm_max
-        
-        gyro = window[:, 3:]  # Keep gyro as-is (already relative)
-        
-        window_processed = np.hstack([accel_normalized, gyro])
-        
+        np.divide(out[:, :, :3], accel_norm_max, out=out[:, :, :3])
+
+        out[:, :, 3:] = windows[:, :, 3:]  # Keep gyro as-is (already relative)
+
         # Ensure correct shape
-        assert window_processed.shape[1] == 6, f"Expected 6 features, got {window_processed.shape[1]}"
-        
-        return window_processed
-    
+        assert out.shape[2] == 6, f"Expected 6 features, got {out.shape[2]}"
+
+        return out
+
     def _extract_handcrafted_features(
         self,
-        window: np.ndarray,
-        speed: float,
-        heading: float
+        windows: np.ndarray,
+        speeds: np.ndarray,
+        headings: np.ndarray
     ) -> np.ndarray:
-        """Extract handcrafted features (24-dim vector)."""
-        
-        accel = window[:, :3]
-        accel_mag = np.linalg.norm(accel, axis=1)
-        
-        features = []
-        
-        # Statistical: mean, std per axis + magnitude
-        for i in range(3):
-            features.append(np.mean(accel[:, i]))
-            features.append(np.std(accel[:, i]))
-        features.append(np.mean(accel_mag))
-        features.append(np.std(accel_mag))
-        features.append(np.sqrt(np.mean(accel_mag ** 2)))
-        
-        # Spectral (simplified)
-        fft = np.abs(np.fft.fft(accel_mag))
-        freqs = np.fft.fftfreq(len(accel_mag), 1.0 / 100)  # 100 Hz sampling
-        pos_idx = freqs > 0
-        
-        energy_0_5 = np.sum(fft[pos_idx & (freqs < 5)]) ** 2 if np.any(pos_idx) else 0
-        energy_5_15 = np.sum(fft[pos_idx & (freqs < 15)]) ** 2 if np.any(pos_idx) else 0
-        energy_15_30 = np.sum(fft[pos_idx & (freqs <= 30)]) ** 2 if np.any(pos_idx) else 0
-        
-        features.extend([energy_0_5, energy_5_15, energy_15_30])
-        
-        # Spectral centroid, bandwidth
-        if np.any(pos_idx):
-            fft_pos = fft[pos_idx]
-            freqs_pos = freqs[pos_idx]
-            centroid = np.sum(freqs_pos * fft_pos) / np.sum(fft_pos) if np.sum(fft_pos) > 0 else 0
-            bandwidth = np.sqrt(
-                np.sum(((freqs_pos - centroid) ** 2) * fft_pos) / np.sum(fft_pos)
-            ) if np.sum(fft_pos) > 0 else 0
+        """Extract handcrafted features for a batch: [batch, 21].
+
+        Writes straight into the preallocated feature matrix — no Python
+        list building, no dtype-inference pass, no final stack copy. The
+        returned view is invalidated by the next call; predict_batch
+        copies it into X_combined before handing results out.
+        """
+
+        accel = np.ascontiguousarray(windows[:, :, :3])
+        num_windows, num_samples = accel.shape[0], accel.shape[1]
+
+        if num_windows <= self._max_batch:
+            out = self._feat_out[:num_windows]
         else:
-            centroid = 0
-            bandwidth = 0
-        
-        features.extend([centroid, bandwidth])
-        
-        # Temporal: peaks, max, min, zero-crossings
-        peaks = np.sum((accel_mag[1:-1] > accel_mag[:-2]) & (accel_mag[1:-1] > accel_mag[2:]))
-        features.extend([peaks, np.max(accel_mag), np.min(accel_mag)])
-        
-        zcr = np.sum(np.abs(np.diff(np.sign(accel_mag - np.mean(accel_mag)))) > 0) / len(accel_mag)
-        features.append(zcr)
-        
+            out = np.empty((num_windows, self.NUM_HANDCRAFTED), dtype=np.float32)
+
+        # Statistical: mean, std per axis + magnitude, fused into one
+        # compiled sweep that also produces the magnitude signal. The
+        # magnitude stays FP32 so the rFFT below runs in single precision
+        # (complex64): half the bytes through the memory-bound spectral
+        # block, completing the FP32 path from features through the RF.
+        accel_mag = np.empty((num_windows, num_samples), dtype=np.float32)
+        _time_stats(accel, accel_mag, out[:, :9])
+
+        # Spectral (simplified). Real-input rFFT: half the spectrum of a
+        # full FFT for the same positive-frequency magnitudes. Frequencies
+        # are monotonic, so band energies are contiguous slice sums rather
+        # than boolean-mask gathers.
+        fft = np.abs(scipy.fft.rfft(accel_mag, axis=1, workers=-1))
+
+        out[:, 9] = np.sum(fft[:, 1:self._i5], axis=1) ** 2
+        out[:, 10] = np.sum(fft[:, 1:self._i15], axis=1) ** 2
+        out[:, 11] = np.sum(fft[:, 1:self._i30], axis=1) ** 2
+
+        # Spectral centroid, bandwidth
+        fft_pos = fft[:, 1:self._pos_end]
+        freqs_pos = self._freqs_pos
+        fft_sum = np.sum(fft_pos, axis=1)
+        safe_sum = np.where(fft_sum > 0, fft_sum, 1.0)
+        centroid = np.where(fft_sum > 0, np.sum(freqs_pos * fft_pos, axis=1) / safe_sum, 0.0)
+        out[:, 12] = centroid
+        out[:, 13] = np.where(
+            fft_sum > 0,
+            np.sqrt(np.sum(((freqs_pos - centroid[:, None]) ** 2) * fft_pos, axis=1) / safe_sum),
+            0.0
+        )
+
+        # Temporal: peaks, max, min, zero-crossings in one compiled sweep,
+        # reusing the magnitude mean the stats kernel already produced
+        _mag_temporal(accel_mag, out[:, 6], out[:, 14:18])
+
         # Context: speed, heading, grade
-        features.extend([speed, heading, 0.0])
-        
-        assert len(features) == 24, f"Expected 24 features, got {len(features)}"
-        
-        return np.array(features)
+        out[:, 18] = speeds
+        out[:, 19] = headings
+        out[:, 20] = 0.0
+
+        return out
 
 
 if __name__ == "__main__":
@@ -49,49 +49,75 @@ class LSTMEncoder(nn.Module):
         self.input_features = input_features
         self.embedding_dim = embedding_dim
         self.bidirectional = bidirectional
-        
-        # Build LSTM layers
-        self.lstm_layers = nn.ModuleList()
-        
-        input_dim = input_features
-        for i in range(num_layers):
-            lstm = nn.LSTM(
-                input_size=input_dim,
-                hidden_size=hidden_units[i],
+
+        # Uniform hidden sizes: one multi-layer nn.LSTM, which cuDNN runs
+        # as a single fused kernel instead of one launch per layer chained
+        # in Python. Heterogeneous sizes fall back to the stacked path.
+        uniform = all(h == hidden_units[0] for h in hidden_units[:num_layers])
+        if uniform:
+            self.lstm = nn.LSTM(
+                input_size=input_features,
+                hidden_size=hidden_units[0],
+                num_layers=num_layers,
                 batch_first=True,
-                dropout=dropout if i < num_layers - 1 else 0,
+                dropout=dropout if num_layers > 1 else 0,
                 bidirectional=bidirectional
             )
-            self.lstm_layers.append(lstm)
-            # Next layer's input is current hidden size (doubled if bidirectional)
-            input_dim = hidden_units[i] * (2 if bidirectional else 1)
-        
+            self.lstm_layers = None
+            input_dim = hidden_units[0] * (2 if bidirectional else 1)
+        else:
+            self.lstm = None
+            self.lstm_layers = nn.ModuleList()
+
+            input_dim = input_features
+            for i in range(num_layers):
+                lstm = nn.LSTM(
+                    input_size=input_dim,
+                    hidden_size=hidden_units[i],
+                    batch_first=True,
+                    dropout=dropout if i < num_layers - 1 else 0,
+                    bidirectional=bidirectional
+                )
+                self.lstm_layers.append(lstm)
+                # Next layer's input is current hidden size (doubled if bidirectional)
+                input_dim = hidden_units[i] * (2 if bidirectional else 1)
+
         # Output projection: lstm_output -> embedding_dim
         self.projection = nn.Linear(input_dim, embedding_dim)
         self.dropout = nn.Dropout(dropout)
         self.relu = nn.ReLU()
-    
+
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
         Forward pass.
-        
+
         Args:
             x: [batch_size, sequence_length, input_features]
-        
+
         Returns:
             embedding: [batch_size, embedding_dim]
         """
-        for lstm in self.lstm_layers:
-            x, _ = lstm(x)
-        
-        # Take last output (temporal pattern summary)
-        x = x[:, -1, :]  # [batch_size, lstm_hidden_dim]
-        
+        if self.lstm is not None:
+            _, (h_n, _) = self.lstm(x)
+        else:
+            for lstm in self.lstm_layers:
+                x, (h_n, _) = lstm(x)
+
+        # Final hidden state as the temporal summary. h_n avoids keeping
+        # the full [B, T, H] output around just to slice one step, and for
+        # the bidirectional case it is also the correct object: the
+        # backward direction's summary lives at t=0, not at t=T-1 where
+        # the old out[:, -1, :] slice read it.
+        if self.bidirectional:
+            x = torch.cat([h_n[-2], h_n[-1]], dim=-1)  # [batch_size, 2*hidden]
+        else:
+            x = h_n[-1]  # [batch_size, hidden]
+
         # Project to embedding
         x = self.dropout(x)
         embedding = self.projection(x)  # [batch_size, embedding_dim]
         embedding = self.relu(embedding)
-        
+
         return embedding
 
 
@@ -160,26 +186,36 @@ def train_lstm_encoder(
     """
     
     Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # Convert to torch tensors
-    X_train_t = torch.FloatTensor(X_train).to(device)
-    y_train_t = torch.LongTensor(y_train).to(device)
-    X_val_t = torch.FloatTensor(X_val).to(device)
-    y_val_t = torch.LongTensor(y_val).to(device)
-    
+
+    use_cuda = str(device).startswith("cuda")
+
+    # Keep the dataset CPU-resident: preloading the full train/val arrays
+    # to the GPU wastes VRAM and OOMs on realistic dataset sizes. Pinned
+    # batches stream over asynchronously inside the epoch loop instead.
+    X_train_t = torch.from_numpy(X_train).float()
+    y_train_t = torch.from_numpy(y_train).long()
+    X_val_t = torch.from_numpy(X_val).float()
+    y_val_t = torch.from_numpy(y_val).long()
+
     # Create datasets and loaders
     train_dataset = TensorDataset(X_train_t, y_train_t)
     val_dataset = TensorDataset(X_val_t, y_val_t)
-    
+
     train_loader = DataLoader(
         train_dataset,
         batch_size=config['lstm']['batch_size'],
-        shuffle=True
+        shuffle=True,
+        pin_memory=use_cuda,
+        num_workers=4,
+        persistent_workers=True
     )
     val_loader = DataLoader(
         val_dataset,
         batch_size=config['lstm']['batch_size'],
-        shuffle=False
+        shuffle=False,
+        pin_memory=use_cuda,
+        num_workers=4,
+        persistent_workers=True
     )
     
     # Initialize model
@@ -216,9 +252,15 @@ def train_lstm_encoder(
         model.train()
         train_loss = 0.0
         for X_batch, y_batch in train_loader:
+            X_batch = X_batch.to(device, non_blocking=True)
+            y_batch = y_batch.to(device, non_blocking=True)
             optimizer.zero_grad()
-            _, logits = model(X_batch)
-            loss = criterion(logits, y_batch)
+            # BF16 autocast halves activation/weight-read bandwidth on the
+            # LSTM; BF16 keeps FP32 range so no gradient scaler is needed.
+            # Master weights stay FP32 in the optimizer.
+            with torch.autocast(device_type="cuda", dtype=torch.bfloat16, enabled=use_cuda):
+                _, logits = model(X_batch)
+                loss = criterion(logits, y_batch)
             loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
             optimizer.step()
@@ -231,8 +273,11 @@ def train_lstm_encoder(
         val_loss = 0.0
         with torch.no_grad():
             for X_batch, y_batch in val_loader:
-                _, logits = model(X_batch)
-                loss = criterion(logits, y_batch)
+                X_batch = X_batch.to(device, non_blocking=True)
+                y_batch = y_batch.to(device, non_blocking=True)
+                with torch.autocast(device_type="cuda", dtype=torch.bfloat16, enabled=use_cuda):
+                    _, logits = model(X_batch)
+                    loss = criterion(logits, y_batch)
                 val_loss += loss.item()
         
         val_loss /= len(val_loader)
@@ -284,15 +329,28 @@ def extract_embeddings(
     """
     encoder.eval()
     encoder = encoder.to(device)
-    
-    embeddings = []
-    with torch.no_grad():
-        for i in range(0, len(X), batch_size):
-            X_batch = torch.FloatTensor(X[i:i+batch_size]).to(device)
-            emb = encoder(X_batch).cpu().numpy()
-            embeddings.append(emb)
-    
-    embeddings = np.vstack(embeddings)
+    use_cuda = str(device).startswith("cuda")
+
+    # Pinned DataLoader overlaps the H2D copy of the next batch with the
+    # encoder running the current one; outputs land in a preallocated
+    # matrix, dropping the per-chunk tensor copies and the final vstack
+    loader = DataLoader(
+        TensorDataset(torch.from_numpy(X).float()),
+        batch_size=batch_size,
+        pin_memory=use_cuda,
+        num_workers=2,
+        persistent_workers=True
+    )
+
+    embeddings = np.empty((len(X), encoder.embedding_dim), dtype=np.float32)
+    row = 0
+    with torch.inference_mode():
+        for (X_batch,) in loader:
+            X_batch = X_batch.to(device, non_blocking=True)
+            emb = encoder(X_batch)
+            embeddings[row:row + X_batch.size(0)] = emb.float().cpu().numpy()
+            row += X_batch.size(0)
+
     return embeddings
 
 
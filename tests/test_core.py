@@ -6,12 +6,21 @@ Run with: pytest tests/ -v
 
 import pytest
 import numpy as np
+import scipy.fft
 from datetime import datetime, timedelta
 
 # Mock tests for key components
 # (Actual tests would import and test real modules)
 
 
+@pytest.fixture(scope='module')
+def sine_10hz():
+    """10 Hz sine sampled at 100 Hz, computed once for the module."""
+    fs = 100
+    t = np.arange(0, 1, 1 / fs)
+    return fs, t, np.sin(2 * np.pi * 10 * t)
+
+
 class TestTriggerDetector:
     """Tests for event trigger logic."""
     
@@ -89,21 +98,18 @@ class TestColorMapping:
         else:
             return "red"
     
-    def test_good_road_green(self):
-        """Score > 0.7 should be green."""
-        assert self.score_to_color(0.85) == "green"
-        assert self.score_to_color(0.71) == "green"
-    
-    def test_average_road_yellow(self):
-        """0.4 < score <= 0.7 should be yellow."""
-        assert self.score_to_color(0.70) == "yellow"
-        assert self.score_to_color(0.55) == "yellow"
-        assert self.score_to_color(0.41) == "yellow"
-    
-    def test_poor_road_red(self):
-        """Score <= 0.4 should be red."""
-        assert self.score_to_color(0.40) == "red"
-        assert self.score_to_color(0.20) == "red"
+    @pytest.mark.parametrize("score,expected", [
+        (0.85, "green"),   # score > 0.7
+        (0.71, "green"),
+        (0.70, "yellow"),  # 0.4 < score <= 0.7
+        (0.55, "yellow"),
+        (0.41, "yellow"),
+        (0.40, "red"),     # score <= 0.4
+        (0.20, "red"),
+    ])
+    def test_score_to_color(self, score, expected):
+        """Score maps to the expected visualization color."""
+        assert self.score_to_color(score) == expected
 
 
 class TestRouteEvaluation:
@@ -125,41 +131,33 @@ class TestRouteEvaluation:
         avg_comfort_cost = np.mean([1 - s['comfort_score'] for s in segments])
         
         total_cost = (avg_time_cost * time_weight) + (avg_comfort_cost * comfort_weight)
-        
-        expected_comfort_cost = (1 - 0.8 + 1 - 0.6 + 1 - 0.5) / 3  # ~0.433
-        expected_total = (1.0 * 0.5) + (expected_comfort_cost * 0.5)  # ~0.716
-        
-        assert 0.7 < total_cost < 0.75, f"Expected ~0.716, got {total_cost}"
+
+        expected_comfort_cost = (1 - 0.8 + 1 - 0.6 + 1 - 0.5) / 3  # ~0.367
+        expected_total = (1.0 * 0.5) + (expected_comfort_cost * 0.5)  # ~0.683
+
+        assert 0.65 < total_cost < 0.72, f"Expected ~0.683, got {total_cost}"
 
 
 class TestHandcraftedFeatures:
     """Tests for feature extraction."""
     
     def test_feature_count(self):
-        """Verify 24 handcrafted features extracted."""
+        """Verify 21 handcrafted features extracted."""
         # Placeholder: actual test would extract features from window
-        feature_count = 24
-        assert feature_count == 24
-    
-    def test_spectral_energy_computation(self):
+        feature_count = 21
+        assert feature_count == 21
+
+    def test_spectral_energy_computation(self, sine_10hz):
         """Test spectral energy calculation."""
-        # Simple sine wave at 10 Hz
-        fs = 100  # 100 Hz sampling
-        t = np.arange(0, 1, 1/fs)
-        signal = np.sin(2 * np.pi * 10 * t)
-        
-        # FFT
-        fft = np.abs(np.fft.fft(signal))
-        freqs = np.fft.fftfreq(len(signal), 1/fs)
-        
+        fs, t, signal = sine_10hz
+
+        # rfft returns only non-negative bins; skip DC when peak-finding
+        fft = np.abs(scipy.fft.rfft(signal))
+        freqs = scipy.fft.rfftfreq(len(signal), 1/fs)
+
         # Energy should be concentrated around 10 Hz
-        pos_idx = freqs > 0
-        pos_freqs = freqs[pos_idx]
-        pos_fft = fft[pos_idx]
-        
-        peak_freq_idx = np.argmax(pos_fft)
-        peak_freq = pos_freqs[peak_freq_idx]
-        
+        peak_freq = freqs[1:][np.argmax(fft[1:])]
+
         assert 8 < peak_freq < 12, f"Peak should be ~10 Hz, got {peak_freq:.1f}"
 
 